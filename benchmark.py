@@ -0,0 +1,411 @@
+"""Synthetic-data benchmark for every route.
+
+Generates a deterministic organization of N employees (with titles, departments, projects,
+assignments, payroll periods and milestones), loads it into the configured database, then
+drives each route through the Flask test client. For every scale tier it reports p50/p95/p99
+latency, queries per request and peak Python memory, and saves the results as JSON. Routes are
+timed with the page cache off; pages the cache serves get a second, separate set of cached timings.
+
+The database is dropped and recreated for each tier, so point it at a disposable stand-in:
+
+    DATABASE_URL=sqlite:///benchmark.db flask benchmark --tiers 1000,10000,100000
+
+measure_startup times how long a fresh worker process takes to import the app, build it with
+create_app and answer its first request (see `flask benchmark-startup`).
+"""
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from flask import current_app
+from sqlalchemy import event, insert
+
+from app import (
+    db, calculate_pay, rebuild_project_stats, rebuild_payroll_summaries, reference_cache, page_cache,
+    employee_no_allocator,
+    Division, Department, EmployeeTitle, Employee, Project, EmployeeProject, PayrollHistory, ProjectMilestone
+)
+
+FIRST_NAMES = [
+    'Alice', 'Bob', 'Carla', 'Dev', 'Elena', 'Farid', 'Grace', 'Hiro', 'Ines', 'Jamal',
+    'Kira', 'Liam', 'Maya', 'Noah', 'Olga', 'Pedro', 'Quinn', 'Rosa', 'Sami', 'Tara',
+    'Umar', 'Vera', 'Wen', 'Xavi', 'Yara', 'Zane'
+]
+LAST_NAMES = [
+    'Adams', 'Brown', 'Chen', 'Diaz', 'Evans', 'Fischer', 'Garcia', 'Hughes', 'Ito', 'Jones',
+    'Khan', 'Lopez', 'Miller', 'Novak', 'Okafor', 'Patel', 'Quispe', 'Rossi', 'Smith', 'Tanaka'
+]
+
+INSERT_CHUNK_SIZE = 5000
+FIRST_EMPLOYEE_NO = 1001
+
+
+def _insert_chunked(model, rows):
+    """Bulk-inserts an iterable of row dicts in fixed-size chunks, committing each chunk."""
+    count = 0
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= INSERT_CHUNK_SIZE:
+            db.session.execute(insert(model), chunk)
+            db.session.commit()
+            count += len(chunk)
+            chunk = []
+    if chunk:
+        db.session.execute(insert(model), chunk)
+        db.session.commit()
+        count += len(chunk)
+    return count
+
+
+def generate_dataset(employees, payroll_periods=12, seed=631):
+    """Drops and recreates the schema, then loads a deterministic data set. Returns row counts."""
+    rng = random.Random(seed)
+
+    db.drop_all()
+    db.create_all()
+    reference_cache.invalidate()
+    page_cache.clear()
+    employee_no_allocator.reset()
+
+    counts = {}
+
+    divisions = [f'Division {d}' for d in range(8)]
+    departments = [(f'Department {d}', divisions[d % len(divisions)]) for d in range(40)]
+    titles = [(f'Title {t}', Decimal(3000 + 425 * t).quantize(Decimal('0.01'))) for t in range(40)]
+    titles.append(('Technician', Decimal('0.00')))
+
+    counts['Division'] = _insert_chunked(Division, ({'Division_Name': name} for name in divisions))
+    counts['EmployeeTitle'] = _insert_chunked(EmployeeTitle, ({'Title': t, 'Salary': s} for t, s in titles))
+    counts['Department'] = _insert_chunked(Department, (
+        {'Department_Name': name, 'Division_Name': division, 'Budget': Decimal(rng.randrange(100000, 2000000))}
+        for name, division in departments
+    ))
+
+    staff = []
+    for i in range(employees):
+        is_hourly = rng.random() < 0.3
+        affiliation = rng.random()
+        staff.append({
+            'Employee_No': FIRST_EMPLOYEE_NO + i,
+            'Employee_Name': f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}',
+            'Phone_Number': f'555-{i:07d}',
+            'Title': 'Technician' if is_hourly else titles[rng.randrange(len(titles) - 1)][0],
+            'Department_Name': departments[rng.randrange(len(departments))][0] if affiliation < 0.85 else None,
+            'Division_Name': divisions[rng.randrange(len(divisions))] if 0.85 <= affiliation < 0.95 else None,
+            'Is_Hourly': is_hourly,
+            'Hourly_Rate': Decimal(rng.randrange(2000, 6000)) / 100 if is_hourly else None,
+            'Is_Active': rng.random() >= 0.03
+        })
+    counts['Employee'] = _insert_chunked(Employee, staff)
+
+    project_count = max(10, employees // 100)
+    projects = []
+    for p in range(project_count):
+        started = date(2023, 1, 1) + timedelta(days=rng.randrange(900))
+        projects.append({
+            'Project_No': p + 1,
+            'Budget': Decimal(rng.randrange(50000, 5000000)),
+            'Date_Started': started,
+            'Date_Ended': started + timedelta(days=rng.randrange(60, 400)) if rng.random() < 0.3 else None,
+            'Manager_Employee_No': FIRST_EMPLOYEE_NO + p
+        })
+    counts['Project'] = _insert_chunked(Project, projects)
+
+    def assignments():
+        for i, employee in enumerate(staff):
+            project_nos = set()
+            if i < project_count:
+                project_nos.add(i + 1)
+            if rng.random() < 0.8:
+                project_nos.add(rng.randrange(project_count) + 1)
+            if rng.random() < 0.3:
+                project_nos.add(rng.randrange(project_count) + 1)
+            for n, project_no in enumerate(sorted(project_nos)):
+                project = projects[project_no - 1]
+                ended = project['Date_Ended'] or (project['Date_Started'] + timedelta(days=200) if n else None)
+                yield {
+                    'Employee_No': employee['Employee_No'],
+                    'Project_No': project_no,
+                    'Role': 'Project Manager' if i == project_no - 1 else rng.choice(['Engineer', 'Analyst', 'Technician', 'QA']),
+                    'Hours_Worked': Decimal(rng.randrange(0, 200000)) / 100,
+                    'Date_Started': project['Date_Started'],
+                    'Date_Ended': ended
+                }
+    counts['EmployeeProject'] = _insert_chunked(EmployeeProject, assignments())
+
+    salaries = dict(titles)
+
+    def payroll():
+        for period in range(payroll_periods):
+            # Last day of each month, walking back from December 2025.
+            month = 12 - period % 12
+            year = 2025 - period // 12
+            payment_date = (date(year + (month == 12), month % 12 + 1, 1) - timedelta(days=1))
+            for employee in staff:
+                if not employee['Is_Active']:
+                    continue
+                if employee['Is_Hourly']:
+                    gross = float(employee['Hourly_Rate']) * rng.randrange(80, 180)
+                else:
+                    gross = float(salaries[employee['Title']])
+                gross_pay, fed_tax, state_tax, other_tax, net_pay = calculate_pay(gross)
+                yield {
+                    'Employee_No': employee['Employee_No'],
+                    'Payment_Date': payment_date,
+                    'Gross_Pay': gross_pay,
+                    'Federal_Tax': fed_tax,
+                    'State_Tax': state_tax,
+                    'Other_Tax': other_tax,
+                    'Net_Pay': net_pay
+                }
+    counts['Payroll_History'] = _insert_chunked(PayrollHistory, payroll())
+
+    def milestones():
+        for project in projects:
+            for m in range(10):
+                yield {
+                    'Project_No': project['Project_No'],
+                    'milestone_description': f"Milestone {m} for project {project['Project_No']}",
+                    'Date_Logged': project['Date_Started'] + timedelta(days=rng.randrange(0, 300))
+                }
+    counts['ProjectMilestone'] = _insert_chunked(ProjectMilestone, milestones())
+
+    rebuild_project_stats()
+    rebuild_payroll_summaries()
+    db.session.commit()
+    return counts
+
+
+def benchmark_requests(employees):
+    """Returns (name, method, url, body, max_iterations) for every route.
+
+       body(i) builds the keyword arguments for the i-th request (form data or JSON); max_iterations
+       caps routes whose every call does work proportional to the whole data set, like payroll_run.
+    """
+    middle = FIRST_EMPLOYEE_NO + employees // 2
+    today = date.today().isoformat()
+    return [
+        ('main_dashboard', 'GET', '/', None, None),
+        ('hr_dashboard', 'GET', '/hr_dashboard', None, None),
+        ('hr_dashboard_deep_page', 'GET', f'/hr_dashboard?page={max(1, employees // 100)}', None, None),
+        ('hr_dashboard_search', 'GET', '/hr_dashboard?name=Maya&department=Department+3', None, None),
+        ('payroll_history', 'GET', '/payroll_history', None, None),
+        ('payroll_history_deep_cursor', 'GET', '/payroll_history?after=2025-03-31_1', None, None),
+        ('payroll_history_filtered', 'GET', f'/payroll_history?employee_no={middle}&date_from=2025-01-01', None, None),
+        ('payroll_history_department', 'GET', '/payroll_history?department=Department+7', None, None),
+        ('pm_dashboard', 'GET', '/pm_dashboard', None, None),
+        ('view_project', 'GET', '/project/1', None, None),
+        ('add_employee_form', 'GET', '/add_employee', None, None),
+        ('edit_employee_form', 'GET', f'/edit_employee/{middle}', None, None),
+        ('create_project_form', 'GET', '/create_project', None, None),
+        ('payroll_run_form', 'GET', '/payroll_run', None, None),
+        ('add_employee', 'POST', '/add_employee', lambda i: {'data': {
+            'employee_name': f'Benchmark Hire {i}', 'phone_number': '555-0000', 'title': 'Title 1',
+            'pay_type': 'salaried', 'salary_rate': '5000', 'affiliation_type': 'department',
+            'department_name': 'Department 1'
+        }}, None),
+        ('generate_payroll', 'POST', f'/payroll/{FIRST_EMPLOYEE_NO + 1}', lambda i: {'data': {'hours': '10'}}, None),
+        ('add_milestone', 'POST', '/add_milestone/1', lambda i: {'data': {
+            'milestone_description': f'Benchmark milestone {i}', 'date_logged': today
+        }}, None),
+        ('add_team_member', 'POST', '/add_team_member/2', lambda i: {'data': {
+            'employee_no': str(FIRST_EMPLOYEE_NO + employees - 1 - i), 'role': 'Engineer', 'date_started': today
+        }}, None),
+        ('timesheets', 'POST', '/timesheets', lambda i: {'json': {
+            'batch_key': f'benchmark-{i}',
+            'entries': [{'employee_no': FIRST_EMPLOYEE_NO + e, 'project_no': e + 1, 'hours': 7.5, 'date': today}
+                        for e in range(10)]
+        }}, None),
+        ('payroll_run', 'POST', '/payroll_run', lambda i: {'data': {
+            'payment_date': (date(2026, 1, 31) + timedelta(days=i)).isoformat(), 'hours_batch': ''
+        }}, 3),
+    ]
+
+
+def _percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _time_requests(client, method, url, body, runs, statements):
+    """Sends runs requests and returns their sorted latencies (ms), queries per request and status codes."""
+    latencies = []
+    queries = []
+    statuses = set()
+    for i in range(runs):
+        statements[0] = 0
+        began = time.perf_counter()
+        response = client.open(url, method=method, **(body(i) if body else {}))
+        response.get_data()
+        latencies.append((time.perf_counter() - began) * 1000)
+        queries.append(statements[0])
+        statuses.add(response.status_code)
+    latencies.sort()
+    return latencies, queries, statuses
+
+
+def _latency_stats(latencies, queries):
+    return {
+        'p50_ms': round(_percentile(latencies, 50), 3),
+        'p95_ms': round(_percentile(latencies, 95), 3),
+        'p99_ms': round(_percentile(latencies, 99), 3),
+        'mean_ms': round(sum(latencies) / len(latencies), 3),
+        'queries_per_request': round(sum(queries) / len(queries), 2)
+    }
+
+
+def run_tier(employees, iterations, payroll_periods, seed):
+    """Loads one scale tier and measures every route. Returns the tier's result dict.
+
+       Every route is timed with the page cache off, so the numbers reflect its queries. GET routes
+       the cache serves are then timed again from a warm cache and reported under 'cached'.
+    """
+    started = time.perf_counter()
+    counts = generate_dataset(employees, payroll_periods=payroll_periods, seed=seed)
+    load_seconds = time.perf_counter() - started
+
+    client = current_app.test_client()
+    statements = [0]
+
+    def count_statement(*args):
+        statements[0] += 1
+
+    routes = {}
+    cache_enabled = current_app.config["PAGE_CACHE_ENABLED"]
+    event.listen(db.engine, 'before_cursor_execute', count_statement)
+    try:
+        for name, method, url, body, max_iterations in benchmark_requests(employees):
+            runs = min(iterations, max_iterations or iterations)
+
+            current_app.config["PAGE_CACHE_ENABLED"] = False
+            latencies, queries, statuses = _time_requests(client, method, url, body, runs, statements)
+
+            # Separate pass for memory, since tracing skews latency.
+            tracemalloc.start()
+            response = client.open(url, method=method, **(body(runs) if body else {}))
+            response.get_data()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            routes[name] = {
+                'method': method,
+                'url': url,
+                'requests': runs,
+                **_latency_stats(latencies, queries),
+                'peak_memory_kb': round(peak / 1024, 1),
+                'status_codes': sorted(statuses)
+            }
+
+            if method == 'GET':
+                current_app.config["PAGE_CACHE_ENABLED"] = True
+                page_cache.clear()
+                client.open(url, method=method).get_data()
+                hits = page_cache.hits
+                latencies, queries, statuses = _time_requests(client, method, url, body, runs, statements)
+                if page_cache.hits > hits:
+                    routes[name]['cached'] = _latency_stats(latencies, queries)
+    finally:
+        current_app.config["PAGE_CACHE_ENABLED"] = cache_enabled
+        event.remove(db.engine, 'before_cursor_execute', count_statement)
+
+    return {
+        'employees': employees,
+        'rows': counts,
+        'load_seconds': round(load_seconds, 2),
+        'routes': routes
+    }
+
+
+def run_benchmark(tiers, iterations=50, payroll_periods=12, seed=631):
+    """Runs every tier and returns the full, JSON-serializable result."""
+    return {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'database': db.engine.dialect.name,
+        'python': platform.python_version(),
+        'iterations': iterations,
+        'payroll_periods': payroll_periods,
+        'seed': seed,
+        'tiers': [run_tier(n, iterations, payroll_periods, seed) for n in tiers]
+    }
+
+
+# Run in a fresh interpreter for each startup sample; prints the phase timings in milliseconds as JSON.
+_STARTUP_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app as module
+imported = time.perf_counter()
+application = module.create_app()
+created = time.perf_counter()
+response = application.test_client().get(sys.argv[1])
+response.get_data()
+answered = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - started) * 1000,
+    'create_app_ms': (created - imported) * 1000,
+    'first_request_ms': (answered - created) * 1000,
+    'status_code': response.status_code
+}))
+"""
+
+
+def measure_startup(runs=5, url='/'):
+    """Starts runs fresh Python processes (as a newly forked or spawned worker would) and times the
+       import of app.py, create_app and the first request to url in each. Returns min/median/max per phase.
+
+       Each process inherits this environment, so it uses the same DATABASE_URL.
+    """
+    samples = []
+    for _ in range(runs):
+        began = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, '-c', _STARTUP_PROBE, url],
+            cwd=os.path.dirname(os.path.abspath(__file__)), env=os.environ.copy(),
+            capture_output=True, text=True, check=True
+        )
+        sample = json.loads(completed.stdout.strip().splitlines()[-1])
+        sample['process_ms'] = (time.perf_counter() - began) * 1000
+        samples.append(sample)
+
+    phases = {}
+    for phase in ('import_ms', 'create_app_ms', 'first_request_ms', 'process_ms'):
+        values = sorted(sample[phase] for sample in samples)
+        phases[phase] = {
+            'min': round(values[0], 1),
+            'median': round(_percentile(values, 50), 1),
+            'max': round(values[-1], 1)
+        }
+    return {
+        'runs': runs,
+        'url': url,
+        'status_codes': sorted({sample['status_code'] for sample in samples}),
+        'phases': phases
+    }
+
+
+def compare_results(previous, current):
+    """Yields (employees, route, previous p95, current p95) for routes present in both runs."""
+    previous_tiers = {tier['employees']: tier for tier in previous.get('tiers', [])}
+    for tier in current['tiers']:
+        before = previous_tiers.get(tier['employees'])
+        if not before:
+            continue
+        for route, stats in tier['routes'].items():
+            if route in before['routes']:
+                yield tier['employees'], route, before['routes'][route]['p95_ms'], stats['p95_ms']
+
+
+def save_results(results, path):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, default=str)
@@ -66,6 +66,8 @@ CREATE TABLE Employee(
 
     Is_Hourly BOOLEAN DEFAULT FALSE,
     Hourly_Rate DECIMAL(10, 2),
+
+    Is_Active BOOLEAN DEFAULT TRUE,
     
     FOREIGN KEY (Title) REFERENCES EmployeeTitle(Title),
     FOREIGN KEY (Department_Name) REFERENCES Department(Department_Name),
@@ -85,6 +87,27 @@ CREATE TABLE Room (
     FOREIGN KEY (Building_Code) REFERENCES Building(Building_Code)
 );
 
+-- ================================================================
+-- EMPLOYEE_ROOM / DEPARTMENT_ROOM
+-- Office assignments (one employee per room; departments may share)
+-- ================================================================
+CREATE TABLE EmployeeRoom (
+    Employee_No INT PRIMARY KEY,
+    Room_Number INT UNIQUE,
+
+    FOREIGN KEY (Employee_No) REFERENCES Employee(Employee_No),
+    FOREIGN KEY (Room_Number) REFERENCES Room(Office_Number)
+);
+
+CREATE TABLE DepartmentRoom (
+    Department_Name VARCHAR(100),
+    Room_Number INT,
+    PRIMARY KEY (Department_Name, Room_Number),
+
+    FOREIGN KEY (Department_Name) REFERENCES Department(Department_Name),
+    FOREIGN KEY (Room_Number) REFERENCES Room(Office_Number)
+);
+
 -- ================================================================
 -- EMPLOYEE_PROJECT (UPDATED for Project History)
 -- Now tracks role, time spent, and specific dates for history reporting
@@ -128,6 +151,150 @@ CREATE TABLE ProjectMilestone (
     FOREIGN KEY (Project_No) REFERENCES Project(Project_No)
 );
 
+-- ================================================================
+-- PROJECT_STATS
+-- Per-project rollups maintained by the application on every
+-- assignment, hours and milestone change (see update_project_stats).
+-- Rebuild with: flask rebuild-project-stats
+-- ================================================================
+CREATE TABLE ProjectStats (
+    Project_No INT PRIMARY KEY,
+    Total_Hours DECIMAL(12, 2) NOT NULL DEFAULT 0,
+    Active_Team_Count INT NOT NULL DEFAULT 0,
+    Milestone_Count INT NOT NULL DEFAULT 0,
+    Last_Milestone_Date DATE,
+
+    FOREIGN KEY (Project_No) REFERENCES Project(Project_No)
+);
+
+-- ================================================================
+-- ID_SEQUENCE
+-- Next unreserved value per application-allocated key. Workers
+-- reserve blocks of Employee numbers from here instead of MAX()+1.
+-- ================================================================
+CREATE TABLE IdSequence (
+    Sequence_Name VARCHAR(50) PRIMARY KEY,
+    Next_Value INT NOT NULL
+);
+
+-- ================================================================
+-- TIMESHEET_BATCH
+-- One row per applied timesheet batch, so re-sending a batch is a no-op.
+-- ================================================================
+CREATE TABLE TimesheetBatch (
+    Batch_Key VARCHAR(100) PRIMARY KEY,
+    Received_At DATETIME NOT NULL,
+    Entries_Accepted INT NOT NULL,
+    Entries_Rejected INT NOT NULL,
+    Hours_Applied DECIMAL(12, 2) NOT NULL
+);
+
+-- ================================================================
+-- BACKGROUND_JOB
+-- The background job queue. Workers claim queued rows whose
+-- Run_After has passed; failed attempts are retried with backoff.
+-- ================================================================
+CREATE TABLE BackgroundJob (
+    Job_ID INT PRIMARY KEY AUTO_INCREMENT,
+    Job_Type VARCHAR(50) NOT NULL,
+    Payload TEXT NOT NULL,
+    Status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    Progress INT NOT NULL DEFAULT 0,
+    Progress_Message VARCHAR(255),
+    Result TEXT,
+    Error TEXT,
+    Attempts INT NOT NULL DEFAULT 0,
+    Max_Attempts INT NOT NULL DEFAULT 3,
+    Run_After DATETIME NOT NULL,
+    Created_At DATETIME NOT NULL,
+    Started_At DATETIME,
+    Heartbeat_At DATETIME,
+    Finished_At DATETIME,
+    Worker VARCHAR(100)
+);
+
+-- ================================================================
+-- PAYROLL_EMPLOYEE_MONTH / PAYROLL_DEPARTMENT_MONTH
+-- Payroll_History totals per employee and per department for each
+-- calendar month, maintained with every payroll write so YTD and
+-- quarterly reports never re-sum the history. Department_Name is ''
+-- for employees who belong to no department.
+-- ================================================================
+CREATE TABLE PayrollEmployeeMonth (
+    Employee_No INT NOT NULL,
+    Year INT NOT NULL,
+    Month INT NOT NULL,
+    Payments INT NOT NULL DEFAULT 0,
+    Gross_Pay DECIMAL(14, 2) NOT NULL DEFAULT 0,
+    Federal_Tax DECIMAL(14, 2) NOT NULL DEFAULT 0,
+    State_Tax DECIMAL(14, 2) NOT NULL DEFAULT 0,
+    Other_Tax DECIMAL(14, 2) NOT NULL DEFAULT 0,
+    Net_Pay DECIMAL(14, 2) NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (Employee_No, Year, Month),
+    FOREIGN KEY (Employee_No) REFERENCES Employee(Employee_No)
+);
+
+CREATE TABLE PayrollDepartmentMonth (
+    Department_Name VARCHAR(100) NOT NULL,
+    Year INT NOT NULL,
+    Month INT NOT NULL,
+    Payments INT NOT NULL DEFAULT 0,
+    Gross_Pay DECIMAL(14, 2) NOT NULL DEFAULT 0,
+    Federal_Tax DECIMAL(14, 2) NOT NULL DEFAULT 0,
+    State_Tax DECIMAL(14, 2) NOT NULL DEFAULT 0,
+    Other_Tax DECIMAL(14, 2) NOT NULL DEFAULT 0,
+    Net_Pay DECIMAL(14, 2) NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (Department_Name, Year, Month)
+);
+
+-- ================================================================
+-- PAYROLL_ARCHIVE
+-- One row per closed year moved out of Payroll_History into its own
+-- Payroll_History_<Year> table (same columns and indexes), created by
+-- `flask archive-payroll`. Readers only open the years a date range
+-- reaches, and no payment may be dated in an archived year.
+-- ================================================================
+CREATE TABLE PayrollArchive (
+    Year INT PRIMARY KEY,
+    Table_Name VARCHAR(64) NOT NULL,
+    Row_Count INT NOT NULL DEFAULT 0,
+    Archived_At DATETIME NOT NULL
+);
+
+-- ================================================================
+-- MILESTONE_SEARCH_TERM / MILESTONE_SEARCH_POSTING
+-- Inverted index over ProjectMilestone.milestone_description, kept
+-- current by add_milestone: each term with the number of milestones
+-- containing it, and one posting per term and milestone with the
+-- term's frequency. Rebuild with: flask rebuild-milestone-index
+-- ================================================================
+CREATE TABLE MilestoneSearchTerm (
+    Term VARCHAR(64) PRIMARY KEY,
+    Milestone_Count INT NOT NULL DEFAULT 0
+);
+
+CREATE TABLE MilestoneSearchPosting (
+    Term VARCHAR(64) NOT NULL,
+    Milestone_No INT NOT NULL,
+    Frequency INT NOT NULL,
+
+    PRIMARY KEY (Term, Milestone_No),
+    FOREIGN KEY (Milestone_No) REFERENCES ProjectMilestone(Milestone_No)
+);
+
+-- ================================================================
+-- PAGE_CACHE_VERSION
+-- Version of each table, bumped in the same transaction as every
+-- write to it. Cached pages and in-memory indexes in every worker
+-- compare these before reusing what they built.
+-- ================================================================
+CREATE TABLE PageCacheVersion (
+    Table_Name VARCHAR(64) PRIMARY KEY,
+    Version INT NOT NULL DEFAULT 0
+);
+
 -- ================================================================
 -- Adding Foreign Keys for Head Employees
 -- Note: It's best practice to add these after the Employee table is defined.
@@ -141,6 +308,48 @@ ADD FOREIGN KEY (Head_Employee_No) REFERENCES Employee(Employee_No);
 ALTER TABLE Project
 ADD FOREIGN KEY (Manager_Employee_No) REFERENCES Employee(Employee_No);
 
+-- ================================================================
+-- Secondary indexes for hot read paths
+-- ================================================================
+-- Payroll history is paged newest-first by (Payment_Date, Payroll_ID) keyset;
+-- the employee filter seeks on Employee_No and keeps the same ordering.
+-- The department filter joins through Employee(Department_Name), which is
+-- already indexed by its foreign key.
+CREATE INDEX idx_payroll_date_id ON Payroll_History (Payment_Date, Payroll_ID);
+CREATE INDEX idx_payroll_employee_date_id ON Payroll_History (Employee_No, Payment_Date, Payroll_ID);
+-- Each archived Payroll_History_<Year> table gets the same two indexes,
+-- named idx_payroll_<Year>_date_id and idx_payroll_<Year>_employee_date_id.
+-- An employee is paid at most once per payment date, even when two payroll
+-- runs for the same date overlap.
+CREATE UNIQUE INDEX uq_payroll_employee_date ON Payroll_History (Employee_No, Payment_Date);
+
+-- The HR dashboard lists active employees by name (with name-prefix search)
+-- and looks up each visible employee's active assignment.
+CREATE INDEX idx_employee_active_name ON Employee (Is_Active, Employee_Name);
+CREATE INDEX idx_employee_project_employee_ended ON EmployeeProject (Employee_No, Date_Ended);
+
+-- Project pages read a project's active team and its milestones newest-first.
+CREATE INDEX idx_employee_project_project_ended ON EmployeeProject (Project_No, Date_Ended);
+CREATE INDEX idx_milestone_project_date ON ProjectMilestone (Project_No, Date_Logged);
+
+-- Job workers look for the oldest queued job that is due.
+CREATE INDEX idx_job_status_run_after ON BackgroundJob (Status, Run_After, Job_ID);
+
+-- Quarterly and year-to-date reports read every department's rows for a year.
+CREATE INDEX idx_payroll_department_month_period ON PayrollDepartmentMonth (Year, Month);
+
+-- Space allocation looks for free rooms by building, type and size, and
+-- checks whether any department holds a room.
+CREATE INDEX idx_room_building_type_size ON Room (Building_Code, Type, Square_Feet);
+CREATE INDEX idx_department_room_room ON DepartmentRoom (Room_Number);
+
+-- Milestone search seeks MilestoneSearchPosting by its primary key
+-- (Term, Milestone_No), so the index tables need no secondary indexes.
+
+-- Existing databases: run `flask migrate` to add these indexes and any
+-- missing tables/columns (see migrations.py). `flask check-query-plans`
+-- EXPLAINs every route's statements and fails on a full table scan.
+
 -- ================================================================
 -- Relational queries for populating database with fake data for testing.
 -- ================================================================
@@ -215,4 +424,35 @@ INSERT INTO EmployeeProject (Employee_No, Project_No, Role, Hours_Worked, Date_S
 (2002, 101, 'Engineer', 160.00, '2025-04-10', NULL);
 
 INSERT INTO Payroll_History (Employee_No, Payment_Date, Gross_Pay, Federal_Tax, State_Tax, Other_Tax, Net_Pay) VALUES
-(1001, '2025-11-30', 25000.00, 2500.00, 1250.00, 750.00, 20500.00);
\ No newline at end of file
+(1001, '2025-11-30', 25000.00, 2500.00, 1250.00, 750.00, 20500.00);
+
+-- Start the Employee sequence after the seeded employees.
+INSERT INTO IdSequence (Sequence_Name, Next_Value)
+SELECT 'Employee', COALESCE(MAX(Employee_No), 1000) + 1 FROM Employee;
+
+-- Seed ProjectStats from the rows above.
+INSERT INTO ProjectStats (Project_No, Total_Hours, Active_Team_Count, Milestone_Count, Last_Milestone_Date)
+SELECT p.Project_No,
+       COALESCE((SELECT SUM(ep.Hours_Worked) FROM EmployeeProject ep WHERE ep.Project_No = p.Project_No), 0),
+       (SELECT COUNT(*) FROM EmployeeProject ep WHERE ep.Project_No = p.Project_No AND ep.Date_Ended IS NULL),
+       (SELECT COUNT(*) FROM ProjectMilestone pm WHERE pm.Project_No = p.Project_No),
+       (SELECT MAX(pm.Date_Logged) FROM ProjectMilestone pm WHERE pm.Project_No = p.Project_No)
+FROM Project p;
+
+-- Seed the monthly payroll summaries from the rows above.
+INSERT INTO PayrollEmployeeMonth (Employee_No, Year, Month, Payments, Gross_Pay, Federal_Tax, State_Tax, Other_Tax, Net_Pay)
+SELECT Employee_No, YEAR(Payment_Date), MONTH(Payment_Date), COUNT(*),
+       SUM(Gross_Pay), SUM(Federal_Tax), SUM(State_Tax), SUM(Other_Tax), SUM(Net_Pay)
+FROM Payroll_History
+GROUP BY Employee_No, YEAR(Payment_Date), MONTH(Payment_Date);
+
+INSERT INTO PayrollDepartmentMonth (Department_Name, Year, Month, Payments, Gross_Pay, Federal_Tax, State_Tax, Other_Tax, Net_Pay)
+SELECT COALESCE(e.Department_Name, ''), YEAR(ph.Payment_Date), MONTH(ph.Payment_Date), COUNT(*),
+       SUM(ph.Gross_Pay), SUM(ph.Federal_Tax), SUM(ph.State_Tax), SUM(ph.Other_Tax), SUM(ph.Net_Pay)
+FROM Payroll_History ph
+LEFT JOIN Employee e ON e.Employee_No = ph.Employee_No
+GROUP BY COALESCE(e.Department_Name, ''), YEAR(ph.Payment_Date), MONTH(ph.Payment_Date);
+
+-- One version row per table, so the first writes never race to insert one.
+INSERT INTO PageCacheVersion (Table_Name, Version)
+SELECT TABLE_NAME, 0 FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE();
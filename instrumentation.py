@@ -0,0 +1,175 @@
+"""Per-request SQL and rendering instrumentation with N+1 detection.
+
+When enabled, every request records its query count, SQL time, template render time,
+ORM rows hydrated and repeated statement shapes (N+1 suspects). Totals are aggregated
+per endpoint in this process and exposed in Prometheus text format. Requests slower than
+the configured threshold are logged and kept in a short ring buffer.
+
+Nothing is hooked when instrumentation is disabled, so it costs nothing.
+"""
+import logging
+import re
+import threading
+import time
+from collections import Counter, deque
+
+from flask import g, has_request_context, request, before_render_template, template_rendered
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+slow_request_logger = logging.getLogger('slow_requests')
+
+_WHITESPACE = re.compile(r'\s+')
+_IN_LIST = re.compile(r'\bIN\s*\((?:[^()]|\([^()]*\))*\)', re.IGNORECASE)
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+_METRICS = [
+    ('app_requests_total', 'counter', 'Requests handled.', 'requests'),
+    ('app_request_duration_seconds_total', 'counter', 'Wall-clock time spent handling requests.', 'duration'),
+    ('app_sql_queries_total', 'counter', 'SQL statements executed while handling requests.', 'queries'),
+    ('app_sql_duration_seconds_total', 'counter', 'Time spent executing SQL while handling requests.', 'sql_time'),
+    ('app_template_render_seconds_total', 'counter', 'Time spent rendering templates.', 'render_time'),
+    ('app_orm_rows_hydrated_total', 'counter', 'ORM instances loaded from result rows.', 'rows_hydrated'),
+    ('app_n_plus_one_suspects_total', 'counter', 'Statement shapes repeated past the N+1 threshold within one request.', 'n_plus_one'),
+    ('app_slow_requests_total', 'counter', 'Requests slower than the slow-request threshold.', 'slow'),
+]
+
+
+def statement_shape(statement):
+    """Normalizes a SQL statement so executions that differ only in values compare equal."""
+    shape = _IN_LIST.sub('IN (?)', statement)
+    shape = _LITERAL.sub('?', shape)
+    return _WHITESPACE.sub(' ', shape).strip()
+
+
+class SQLInstrumentation:
+    """Collects per-request SQL, render and hydration metrics for a Flask app."""
+
+    def __init__(self, slow_request_seconds=0.5, n_plus_one_threshold=5, slow_request_history=100):
+        self.enabled = False
+        self.slow_request_seconds = slow_request_seconds
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.slow_requests = deque(maxlen=slow_request_history)
+        self._totals = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app, model_base):
+        """Hooks engine, ORM, template and request events. model_base is the declarative base whose loads are counted."""
+        # Engine and ORM hooks are process-wide, so a second application must not add them again.
+        if not self.enabled:
+            event.listen(Engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', self._after_cursor_execute)
+            event.listen(model_base, 'load', self._on_load, propagate=True)
+        self.enabled = True
+        before_render_template.connect(self._before_render, app)
+        template_rendered.connect(self._after_render, app)
+        app.before_request(self._start_request)
+        app.teardown_request(self._finish_request)
+
+    # -- per-request collection ---------------------------------------------------------------
+
+    def _current(self):
+        if has_request_context():
+            return g.get('_sql_instrumentation')
+        return None
+
+    def _start_request(self):
+        g._sql_instrumentation = {
+            'started': time.perf_counter(),
+            'queries': 0,
+            'sql_time': 0.0,
+            'render_time': 0.0,
+            'render_started': [],
+            'rows_hydrated': 0,
+            'shapes': Counter()
+        }
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self._current() is not None:
+            conn.info.setdefault('_instrumentation_started', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        state = self._current()
+        started = conn.info.get('_instrumentation_started')
+        if state is None or not started:
+            return
+        state['sql_time'] += time.perf_counter() - started.pop()
+        state['queries'] += 1
+        state['shapes'][statement_shape(statement)] += 1
+
+    def _on_load(self, target, context):
+        state = self._current()
+        if state is not None:
+            state['rows_hydrated'] += 1
+
+    def _before_render(self, sender, template, context, **extra):
+        state = self._current()
+        if state is not None:
+            state['render_started'].append(time.perf_counter())
+
+    def _after_render(self, sender, template, context, **extra):
+        state = self._current()
+        if state is not None and state['render_started']:
+            state['render_time'] += time.perf_counter() - state['render_started'].pop()
+
+    def _finish_request(self, exc):
+        state = self._current()
+        if state is None:
+            return
+        g._sql_instrumentation = None
+
+        duration = time.perf_counter() - state['started']
+        endpoint = request.endpoint or 'unmatched'
+        suspects = [(shape, count) for shape, count in state['shapes'].most_common()
+                    if count >= self.n_plus_one_threshold]
+        slow = duration >= self.slow_request_seconds
+
+        with self._lock:
+            totals = self._totals.setdefault(endpoint, Counter())
+            totals['requests'] += 1
+            totals['duration'] += duration
+            totals['queries'] += state['queries']
+            totals['sql_time'] += state['sql_time']
+            totals['render_time'] += state['render_time']
+            totals['rows_hydrated'] += state['rows_hydrated']
+            totals['n_plus_one'] += len(suspects)
+            totals['slow'] += int(slow)
+
+        if slow:
+            record = {
+                'endpoint': endpoint,
+                'method': request.method,
+                'path': request.full_path.rstrip('?'),
+                'duration_seconds': round(duration, 4),
+                'queries': state['queries'],
+                'sql_seconds': round(state['sql_time'], 4),
+                'render_seconds': round(state['render_time'], 4),
+                'rows_hydrated': state['rows_hydrated'],
+                'n_plus_one_suspects': [{'statement': shape, 'count': count} for shape, count in suspects]
+            }
+            self.slow_requests.append(record)
+            slow_request_logger.warning(
+                "Slow request %s %s: %.3fs, %d queries (%.3fs SQL), %.3fs render, %d rows hydrated, %d N+1 suspects",
+                record['method'], record['path'], duration, state['queries'], state['sql_time'],
+                state['render_time'], state['rows_hydrated'], len(suspects)
+            )
+        elif suspects:
+            slow_request_logger.info("N+1 suspects in %s: %s", endpoint, suspects)
+
+    # -- reporting ------------------------------------------------------------------------------
+
+    def snapshot(self):
+        """Returns a copy of the per-endpoint totals."""
+        with self._lock:
+            return {endpoint: dict(totals) for endpoint, totals in self._totals.items()}
+
+    def prometheus_text(self):
+        """Renders the per-endpoint totals in the Prometheus text exposition format."""
+        totals = self.snapshot()
+        lines = []
+        for name, metric_type, help_text, key in _METRICS:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for endpoint in sorted(totals):
+                lines.append(f'{name}{{endpoint="{endpoint}"}} {totals[endpoint].get(key, 0)}')
+        return '\n'.join(lines) + '\n'
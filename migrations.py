@@ -0,0 +1,338 @@
+"""Versioned, repeatable schema migrations.
+
+Each migration inspects the live schema and only applies what is missing, so it is safe
+to run against a database created from any version of database.sql (or from the models
+via db.create_all()). Applied versions are recorded in the SchemaMigration table.
+
+Run with: flask migrate
+"""
+from datetime import datetime
+
+from sqlalchemy import (
+    MetaData, Table, Column, Integer, String, Numeric, Date, DateTime,
+    Text, ForeignKey, Index, func, inspect, insert, select, text
+)
+
+migration_metadata = MetaData()
+
+schema_migration_table = Table(
+    'SchemaMigration', migration_metadata,
+    Column('Version', Integer, primary_key=True),
+    Column('Name', String(200), nullable=False),
+    Column('Applied_At', DateTime, nullable=False)
+)
+
+# Table definitions are frozen here as they were when each migration was written,
+# so later model changes never alter what an old migration does.
+employee_room_table = Table(
+    'EmployeeRoom', migration_metadata,
+    Column('Employee_No', Integer, ForeignKey('Employee.Employee_No'), primary_key=True),
+    Column('Room_Number', Integer, ForeignKey('Room.Office_Number'), unique=True)
+)
+
+department_room_table = Table(
+    'DepartmentRoom', migration_metadata,
+    Column('Department_Name', String(100), ForeignKey('Department.Department_Name'), primary_key=True),
+    Column('Room_Number', Integer, ForeignKey('Room.Office_Number'), primary_key=True)
+)
+
+project_stats_table = Table(
+    'ProjectStats', migration_metadata,
+    Column('Project_No', Integer, ForeignKey('Project.Project_No'), primary_key=True),
+    Column('Total_Hours', Numeric(12, 2), nullable=False, server_default='0'),
+    Column('Active_Team_Count', Integer, nullable=False, server_default='0'),
+    Column('Milestone_Count', Integer, nullable=False, server_default='0'),
+    Column('Last_Milestone_Date', Date)
+)
+
+id_sequence_table = Table(
+    'IdSequence', migration_metadata,
+    Column('Sequence_Name', String(50), primary_key=True),
+    Column('Next_Value', Integer, nullable=False)
+)
+
+timesheet_batch_table = Table(
+    'TimesheetBatch', migration_metadata,
+    Column('Batch_Key', String(100), primary_key=True),
+    Column('Received_At', DateTime, nullable=False),
+    Column('Entries_Accepted', Integer, nullable=False),
+    Column('Entries_Rejected', Integer, nullable=False),
+    Column('Hours_Applied', Numeric(12, 2), nullable=False)
+)
+
+background_job_table = Table(
+    'BackgroundJob', migration_metadata,
+    Column('Job_ID', Integer, primary_key=True, autoincrement=True),
+    Column('Job_Type', String(50), nullable=False),
+    Column('Payload', Text, nullable=False),
+    Column('Status', String(20), nullable=False, server_default='queued'),
+    Column('Progress', Integer, nullable=False, server_default='0'),
+    Column('Progress_Message', String(255)),
+    Column('Result', Text),
+    Column('Error', Text),
+    Column('Attempts', Integer, nullable=False, server_default='0'),
+    Column('Max_Attempts', Integer, nullable=False, server_default='3'),
+    Column('Run_After', DateTime, nullable=False),
+    Column('Created_At', DateTime, nullable=False),
+    Column('Started_At', DateTime),
+    Column('Heartbeat_At', DateTime),
+    Column('Finished_At', DateTime),
+    Column('Worker', String(100))
+)
+
+payroll_employee_month_table = Table(
+    'PayrollEmployeeMonth', migration_metadata,
+    Column('Employee_No', Integer, ForeignKey('Employee.Employee_No'), primary_key=True),
+    Column('Year', Integer, primary_key=True),
+    Column('Month', Integer, primary_key=True),
+    Column('Payments', Integer, nullable=False, server_default='0'),
+    Column('Gross_Pay', Numeric(14, 2), nullable=False, server_default='0'),
+    Column('Federal_Tax', Numeric(14, 2), nullable=False, server_default='0'),
+    Column('State_Tax', Numeric(14, 2), nullable=False, server_default='0'),
+    Column('Other_Tax', Numeric(14, 2), nullable=False, server_default='0'),
+    Column('Net_Pay', Numeric(14, 2), nullable=False, server_default='0')
+)
+
+payroll_department_month_table = Table(
+    'PayrollDepartmentMonth', migration_metadata,
+    Column('Department_Name', String(100), primary_key=True),
+    Column('Year', Integer, primary_key=True),
+    Column('Month', Integer, primary_key=True),
+    Column('Payments', Integer, nullable=False, server_default='0'),
+    Column('Gross_Pay', Numeric(14, 2), nullable=False, server_default='0'),
+    Column('Federal_Tax', Numeric(14, 2), nullable=False, server_default='0'),
+    Column('State_Tax', Numeric(14, 2), nullable=False, server_default='0'),
+    Column('Other_Tax', Numeric(14, 2), nullable=False, server_default='0'),
+    Column('Net_Pay', Numeric(14, 2), nullable=False, server_default='0')
+)
+
+payroll_archive_table = Table(
+    'PayrollArchive', migration_metadata,
+    Column('Year', Integer, primary_key=True, autoincrement=False),
+    Column('Table_Name', String(64), nullable=False),
+    Column('Row_Count', Integer, nullable=False, server_default='0'),
+    Column('Archived_At', DateTime, nullable=False)
+)
+
+milestone_search_term_table = Table(
+    'MilestoneSearchTerm', migration_metadata,
+    Column('Term', String(64), primary_key=True),
+    Column('Milestone_Count', Integer, nullable=False, server_default='0')
+)
+
+milestone_search_posting_table = Table(
+    'MilestoneSearchPosting', migration_metadata,
+    Column('Term', String(64), primary_key=True),
+    Column('Milestone_No', Integer, ForeignKey('ProjectMilestone.Milestone_No'), primary_key=True),
+    Column('Frequency', Integer, nullable=False)
+)
+
+page_cache_version_table = Table(
+    'PageCacheVersion', migration_metadata,
+    Column('Table_Name', String(64), primary_key=True),
+    Column('Version', Integer, nullable=False, server_default='0')
+)
+
+# Referenced tables, declared only so the foreign keys above can be resolved.
+Table('Employee', migration_metadata, Column('Employee_No', Integer, primary_key=True))
+Table('Room', migration_metadata, Column('Office_Number', Integer, primary_key=True))
+Table('Department', migration_metadata, Column('Department_Name', String(100), primary_key=True))
+Table('Project', migration_metadata, Column('Project_No', Integer, primary_key=True))
+Table('ProjectMilestone', migration_metadata, Column('Milestone_No', Integer, primary_key=True))
+
+
+def _add_column_if_missing(conn, table, column, ddl):
+    """Runs ALTER TABLE ... ADD COLUMN unless the column already exists."""
+    columns = {c['name'] for c in inspect(conn).get_columns(table)}
+    if column not in columns:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+
+
+def _create_table_if_missing(conn, table):
+    table.create(conn, checkfirst=True)
+
+
+def _ensure_index(conn, name, table, columns):
+    """Creates the index unless an index (or the primary key) already starts with the same columns.
+
+    MySQL builds an index for every foreign key, so this avoids adding duplicates of those.
+    """
+    inspector = inspect(conn)
+    existing = [ix['column_names'] for ix in inspector.get_indexes(table)]
+    existing += [uc['column_names'] for uc in inspector.get_unique_constraints(table)]
+    existing.append(inspector.get_pk_constraint(table)['constrained_columns'])
+
+    for column_names in existing:
+        if list(column_names[:len(columns)]) == list(columns):
+            return
+
+    index_table = Table(table, MetaData(), *(Column(c) for c in columns))
+    Index(name, *(index_table.c[c] for c in columns)).create(conn)
+
+
+def _ensure_unique_index(conn, name, table, columns):
+    """Creates a unique index on exactly these columns unless a unique index or constraint already covers them.
+
+    Raises RuntimeError, leaving the schema unchanged, if existing rows already repeat a value.
+    """
+    inspector = inspect(conn)
+    existing = [ix['column_names'] for ix in inspector.get_indexes(table) if ix['unique']]
+    existing += [uc['column_names'] for uc in inspector.get_unique_constraints(table)]
+    if any(list(column_names) == list(columns) for column_names in existing):
+        return
+
+    index_table = Table(table, MetaData(), *(Column(c) for c in columns))
+    key = [index_table.c[c] for c in columns]
+    duplicates = conn.execute(
+        select(func.count()).select_from(
+            select(*key).group_by(*key).having(func.count() > 1).subquery()
+        )
+    ).scalar()
+    if duplicates:
+        raise RuntimeError(f"{table} has {duplicates} repeated ({', '.join(columns)}) values; "
+                           f"resolve them before adding {name}.")
+    Index(name, *key, unique=True).create(conn)
+
+
+def migration_0001_employee_is_active(conn):
+    """Adds Employee.Is_Active, which the model relies on for soft termination."""
+    _add_column_if_missing(conn, 'Employee', 'Is_Active', 'BOOLEAN DEFAULT TRUE')
+    conn.execute(text("UPDATE Employee SET Is_Active = TRUE WHERE Is_Active IS NULL"))
+
+
+def migration_0002_room_assignment_tables(conn):
+    """Creates EmployeeRoom and DepartmentRoom, which the models define but database.sql never created."""
+    _create_table_if_missing(conn, employee_room_table)
+    _create_table_if_missing(conn, department_room_table)
+
+
+def migration_0003_project_stats_and_id_sequence(conn):
+    """Creates ProjectStats and IdSequence. Run 'flask rebuild-project-stats' afterwards to populate stats."""
+    _create_table_if_missing(conn, project_stats_table)
+    _create_table_if_missing(conn, id_sequence_table)
+
+
+def migration_0004_route_indexes(conn):
+    """Adds composite indexes for each route's hot filter and ordering."""
+    # hr_dashboard, view_project, create_project: active employees by name.
+    _ensure_index(conn, 'idx_employee_active_name', 'Employee', ['Is_Active', 'Employee_Name'])
+    # payroll_history department filter.
+    _ensure_index(conn, 'idx_employee_department', 'Employee', ['Department_Name'])
+    # hr_dashboard: an employee's active assignment.
+    _ensure_index(conn, 'idx_employee_project_employee_ended', 'EmployeeProject', ['Employee_No', 'Date_Ended'])
+    # view_project, complete_project, add_team_member: a project's active team.
+    _ensure_index(conn, 'idx_employee_project_project_ended', 'EmployeeProject', ['Project_No', 'Date_Ended'])
+    # payroll_history keyset pagination, with and without the employee filter.
+    _ensure_index(conn, 'idx_payroll_date_id', 'Payroll_History', ['Payment_Date', 'Payroll_ID'])
+    _ensure_index(conn, 'idx_payroll_employee_date_id', 'Payroll_History', ['Employee_No', 'Payment_Date', 'Payroll_ID'])
+    # view_project: a project's milestones, newest first.
+    _ensure_index(conn, 'idx_milestone_project_date', 'ProjectMilestone', ['Project_No', 'Date_Logged'])
+
+
+def migration_0005_timesheet_batches(conn):
+    """Creates TimesheetBatch, the idempotency record for timesheet ingestion."""
+    _create_table_if_missing(conn, timesheet_batch_table)
+
+
+def migration_0006_background_jobs(conn):
+    """Creates BackgroundJob, the database-backed job queue, and the index workers poll."""
+    _create_table_if_missing(conn, background_job_table)
+    _ensure_index(conn, 'idx_job_status_run_after', 'BackgroundJob', ['Status', 'Run_After', 'Job_ID'])
+
+
+def migration_0007_payroll_summaries(conn):
+    """Creates the monthly payroll summary tables. Run 'flask rebuild-payroll-summaries' afterwards to backfill them."""
+    _create_table_if_missing(conn, payroll_employee_month_table)
+    _create_table_if_missing(conn, payroll_department_month_table)
+    _ensure_index(conn, 'idx_payroll_department_month_period', 'PayrollDepartmentMonth', ['Year', 'Month'])
+
+
+def migration_0008_room_indexes(conn):
+    """Adds the indexes the space allocation pages use to find free rooms and a room's occupants."""
+    # Free-room lookups by building, type and size.
+    _ensure_index(conn, 'idx_room_building_type_size', 'Room', ['Building_Code', 'Type', 'Square_Feet'])
+    # Whether any department holds a room (the primary key starts with Department_Name).
+    _ensure_index(conn, 'idx_department_room_room', 'DepartmentRoom', ['Room_Number'])
+
+
+def migration_0009_payroll_archive(conn):
+    """Creates PayrollArchive, the record of closed years moved out of Payroll_History by 'flask archive-payroll'."""
+    _create_table_if_missing(conn, payroll_archive_table)
+
+
+
+def migration_0010_milestone_search_index(conn):
+    """Creates the milestone search index tables. Run 'flask rebuild-milestone-index' afterwards to fill them."""
+    _create_table_if_missing(conn, milestone_search_term_table)
+    _create_table_if_missing(conn, milestone_search_posting_table)
+
+
+def migration_0011_payroll_unique_payment(conn):
+    """Allows one Payroll_History row per employee and payment date, so concurrent payroll runs cannot pay anyone twice."""
+    _ensure_unique_index(conn, 'uq_payroll_employee_date', 'Payroll_History', ['Employee_No', 'Payment_Date'])
+
+
+def migration_0012_page_cache_versions(conn):
+    """Creates PageCacheVersion, the per-table versions that invalidate cached pages in every process,
+    with a row for each existing table so the first writes never race to insert one."""
+    _create_table_if_missing(conn, page_cache_version_table)
+    existing = set(conn.execute(select(page_cache_version_table.c.Table_Name)).scalars())
+    missing = [name for name in inspect(conn).get_table_names() if name not in existing]
+    if missing:
+        conn.execute(insert(page_cache_version_table), [{'Table_Name': name, 'Version': 0} for name in missing])
+
+
+# Ordered (version, name, upgrade) list. Append new migrations; never edit or renumber applied ones.
+MIGRATIONS = [
+    (1, 'employee_is_active', migration_0001_employee_is_active),
+    (2, 'room_assignment_tables', migration_0002_room_assignment_tables),
+    (3, 'project_stats_and_id_sequence', migration_0003_project_stats_and_id_sequence),
+    (4, 'route_indexes', migration_0004_route_indexes),
+    (5, 'timesheet_batches', migration_0005_timesheet_batches),
+    (6, 'background_jobs', migration_0006_background_jobs),
+    (7, 'payroll_summaries', migration_0007_payroll_summaries),
+    (8, 'room_indexes', migration_0008_room_indexes),
+    (9, 'payroll_archive', migration_0009_payroll_archive),
+    (10, 'milestone_search_index', migration_0010_milestone_search_index),
+    (11, 'payroll_unique_payment', migration_0011_payroll_unique_payment),
+    (12, 'page_cache_versions', migration_0012_page_cache_versions),
+]
+
+
+def applied_versions(engine):
+    """Returns the set of migration versions recorded as applied."""
+    with engine.begin() as conn:
+        schema_migration_table.create(conn, checkfirst=True)
+        return set(conn.execute(select(schema_migration_table.c.Version)).scalars())
+
+
+def migration_status(engine):
+    """Returns [(version, name, applied)] for every known migration."""
+    applied = applied_versions(engine)
+    return [(version, name, version in applied) for version, name, _ in MIGRATIONS]
+
+
+def apply_migrations(engine, target=None, rerun=False):
+    """Applies pending migrations in order (up to target, if given) and returns the versions run.
+
+    With rerun=True every migration is run again; each is idempotent, so this repairs
+    a schema that drifted after the migration was first recorded.
+    """
+    applied = applied_versions(engine)
+    ran = []
+
+    for version, name, upgrade in MIGRATIONS:
+        if target is not None and version > target:
+            break
+        if version in applied and not rerun:
+            continue
+
+        with engine.begin() as conn:
+            upgrade(conn)
+            if version not in applied:
+                conn.execute(insert(schema_migration_table).values(
+                    Version=version, Name=name, Applied_At=datetime.now()
+                ))
+        ran.append(version)
+
+    return ran
@@ -0,0 +1,51 @@
+"""Query-plan inspection used by 'flask check-query-plans'.
+
+Statements are captured as the routes run and then EXPLAINed on the same database.
+A statement "regresses to a full scan" when the plan reads a whole table without an
+index: 'SCAN <table>' with no index in SQLite, or access type ALL in MySQL.
+"""
+import re
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+# Only statements that read rows have a meaningful plan.
+_EXPLAINABLE = ('SELECT', 'UPDATE', 'DELETE', 'WITH')
+
+_SQLITE_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)(.*)$')
+
+
+@contextmanager
+def capture_statements(engine, label):
+    """Records (label(), statement, parameters) for every statement the engine executes inside the block."""
+    captured = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(_EXPLAINABLE):
+            captured.append((label(), statement, parameters))
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def full_scans(conn, statement, parameters):
+    """EXPLAINs one statement and returns the names of tables it reads with a full scan."""
+    dialect = conn.dialect.name
+
+    if dialect == 'sqlite':
+        plan = conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).all()
+        scanned = []
+        for row in plan:
+            match = _SQLITE_SCAN.match(row[-1])
+            if match and 'INDEX' not in match.group(2):
+                scanned.append(match.group(1))
+        return scanned
+
+    if dialect in ('mysql', 'mariadb'):
+        plan = conn.exec_driver_sql('EXPLAIN ' + statement, parameters).mappings().all()
+        return [row['table'] for row in plan if row['type'] == 'ALL' and row['table']]
+
+    raise NotImplementedError(f"Query plan checks are not supported for the '{dialect}' dialect.")